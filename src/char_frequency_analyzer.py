@@ -8,31 +8,165 @@ Description: 统计《三国演义》中汉字出现频次的完整系统
 """
 
 import re
+import csv
 import json
+import codecs
+import mmap
+import operator
+import os
 import logging
 import time
-from typing import Dict, List, Tuple, Optional
+import warnings
+from typing import Dict, List, Tuple, Optional, Union
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-import chardet
-import matplotlib.pyplot as plt
-import pandas as pd
-from matplotlib import rcParams
+import numpy as np
 
-# 配置中文字体
-rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
-rcParams['axes.unicode_minus'] = False
+# 连续汉字串，供不走NumPy扫描的兼容接口使用
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]+')
+
+def _scan_utf8_cjk(data) -> np.ndarray:
+    """在UTF-8字节流中直接识别汉字，返回码点数组(uint32)
+    
+    U+4E00-U+9FFF 在UTF-8中均为3字节序列，首字节落在 0xE4-0xE9，
+    因此只需定位这些首字节并解码其后两个续字节，ASCII等其他字节整段跳过。
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    
+    # 末尾不足3字节的位置不可能构成完整汉字
+    # 无符号减法使 0xE4-0xE9 之外的字节都落到 5 以上，一次比较即可定位首字节
+    head = buf[:-2]
+    lead = np.flatnonzero((head - np.uint8(0xE4)) <= 5)
+    
+    # 按首字节数一次性分配输出与暂存缓冲区，后续解码全部原地完成
+    codepoints = np.empty(lead.size, dtype=np.uint32)
+    scratch = np.empty(lead.size, dtype=np.uint32)
+    
+    codepoints[:] = buf[lead]
+    codepoints &= 0x0F
+    
+    # 依次并入两个续字节的低6位，同时校验其 10xxxxxx 格式
+    scratch[:] = buf[lead + 1]
+    mask = (scratch & 0xC0) == 0x80
+    scratch &= 0x3F
+    codepoints <<= 6
+    codepoints |= scratch
+    
+    scratch[:] = buf[lead + 2]
+    mask &= (scratch & 0xC0) == 0x80
+    scratch &= 0x3F
+    codepoints <<= 6
+    codepoints |= scratch
+    
+    # 首字节不超过 0xE9 保证了上限 U+9FFF；0xE4 开头还包含 U+4000-U+4DFF，需排除
+    mask &= codepoints >= 0x4E00
+    return codepoints[mask]
+
+# 汉字数达到该规模才使用numba内核，小数据下np.unique已足够快，不值得导入numba
+_JIT_MIN_CODEPOINTS = 1_000_000
+
+# numba为可选依赖，首次需要时才导入并编译；None 表示尚未尝试，False 表示不可用
+_count_codepoints_jit = None
+
+def _count_codepoints(codepoints):
+    """单次遍历累加各汉字频次并记录首次出现位置，汉字范围固定，直接用定长数组计数"""
+    counts = np.zeros(0x9FFF - 0x4E00 + 1, dtype=np.int64)
+    first = np.zeros(0x9FFF - 0x4E00 + 1, dtype=np.int64)
+    for i in range(codepoints.size):
+        slot = codepoints[i] - 0x4E00
+        if counts[slot] == 0:
+            first[slot] = i
+        counts[slot] += 1
+    return counts, first
+
+def _get_count_kernel():
+    """返回numba编译的计数内核，numba未安装时返回None"""
+    global _count_codepoints_jit
+    if _count_codepoints_jit is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _count_codepoints_jit = False
+        else:
+            _count_codepoints_jit = njit(cache=True)(_count_codepoints)
+    return _count_codepoints_jit or None
+
+def _tally_codepoints(codepoints: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """统计码点频次，返回按首次出现顺序排列的(码点, 频次, 首次出现位置)
+    
+    保持首次出现顺序，使频次相同的字符在 most_common 中的先后与逐字计数一致。
+    """
+    kernel = _get_count_kernel() if codepoints.size >= _JIT_MIN_CODEPOINTS else None
+    if kernel is not None:
+        counts, first = kernel(codepoints)
+        values = np.flatnonzero(counts)
+        counts = counts[values]
+        first = first[values]
+        values += 0x4E00
+    else:
+        values, first, counts = np.unique(codepoints, return_index=True, return_counts=True)
+    order = np.argsort(first, kind='stable')
+    return values[order], counts[order], first[order]
+
+def _tally_to_counter(values: np.ndarray, counts: np.ndarray) -> Counter:
+    """把码点与频次数组转换为以汉字为键的Counter，保持数组顺序"""
+    return Counter(dict(zip(map(chr, values.tolist()), counts.tolist())))
+
+def _count_utf8_cjk(data) -> Tuple[Counter, int]:
+    """统计UTF-8缓冲区中的汉字，返回(频次计数器, 汉字总数)"""
+    codepoints = _scan_utf8_cjk(data)
+    values, counts, _ = _tally_codepoints(codepoints)
+    return _tally_to_counter(values, counts), int(codepoints.size)
+
+def _count_file_range(file_path: str, start: int, end: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """在子进程中映射文件，统计 [start, end) 字节区间内的汉字
+    
+    返回(码点, 频次, 首次出现位置)；位置加上区间起点，保证跨区间仍可比较先后。
+    """
+    with open(file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            codepoints = _scan_utf8_cjk(np.frombuffer(mapped, dtype=np.uint8, count=end - start, offset=start))
+    values, counts, first = _tally_codepoints(codepoints)
+    return values, counts, first + start
+
+def _validate_utf8(data, block_size: int = 1024 * 1024):
+    """校验缓冲区是否为合法UTF-8，非法时抛出 UnicodeDecodeError
+    
+    按块增量解码并立即丢弃结果，峰值内存只有一个块解码后的大小，
+    不会为整个缓冲区构造完整的字符串。
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with memoryview(data) as view:
+        for start in range(0, len(view), block_size):
+            decoder.decode(view[start:start + block_size])
+    decoder.decode(b'', final=True)
+
+def _split_utf8(view: memoryview, parts: int) -> List[Tuple[int, int]]:
+    """把UTF-8缓冲区切成约 parts 段，切分点避开多字节字符的续字节"""
+    size = len(view)
+    bounds = [0]
+    for i in range(1, parts):
+        pos = max(size * i // parts, bounds[-1])
+        # 续字节形如 10xxxxxx，向后移动到下一个字符的起始字节
+        while pos < size and (view[pos] & 0xC0) == 0x80:
+            pos += 1
+        bounds.append(pos)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
 
 @dataclass
 class AnalysisConfig:
     """分析配置类"""
     top_n: int = 50
     min_frequency: int = 1
-    exclude_punctuation: bool = True
+    exclude_punctuation: bool = True  # 中文标点(\u3000-\u303f, \uff00-\uffef)不在汉字范围内，扫描时已天然排除
     save_results: bool = True
     generate_charts: bool = True
-    chunk_size: int = 1024 * 1024  # 1MB chunks for large files
+    chunk_size: int = 1024 * 1024  # 已不再使用，仅为兼容旧调用方保留
+    parallel_threshold: int = 8 * 1024 * 1024  # 超过8MB的内存映射UTF-8文件使用多进程统计
+    max_workers: Optional[int] = None  # 并行进程数，默认等于CPU核数
 
 class CharFrequencyAnalyzer:
     """汉字频率分析器"""
@@ -46,7 +180,9 @@ class CharFrequencyAnalyzer:
     def _setup_logger(self) -> logging.Logger:
         """设置日志系统"""
         logger = logging.getLogger('CharFrequencyAnalyzer')
-        logger.setLevel(logging.INFO)
+        # 保留调用方（如Web服务）预先设置的级别
+        if logger.level == logging.NOTSET:
+            logger.setLevel(logging.INFO)
         
         if not logger.handlers:
             handler = logging.StreamHandler()
@@ -59,22 +195,35 @@ class CharFrequencyAnalyzer:
         return logger
     
     def detect_encoding(self, file_path: Path) -> str:
-        """检测文件编码"""
+        """检测文件编码：先识别BOM，再校验UTF-8，否则按GB18030处理"""
         try:
             with open(file_path, 'rb') as f:
-                raw_data = f.read(10000)  # 读取前10KB检测编码
-                result = chardet.detect(raw_data)
-                encoding = result['encoding']
-                confidence = result['confidence']
-                
-                self.logger.info(f"检测到文件编码: {encoding} (置信度: {confidence:.2f})")
-                return encoding or 'utf-8'
+                raw_data = f.read(64 * 1024)  # 读取前64KB检测编码
+            
+            if raw_data.startswith(codecs.BOM_UTF8):
+                encoding = 'utf-8-sig'
+            elif raw_data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+                encoding = 'utf-16'
+            else:
+                try:
+                    # 增量解码允许探测块末尾截断的多字节字符
+                    codecs.getincrementaldecoder('utf-8')().decode(raw_data, final=False)
+                    encoding = 'utf-8'
+                except UnicodeDecodeError:
+                    encoding = 'gb18030'
+            
+            self.logger.info(f"检测到文件编码: {encoding}")
+            return encoding
         except Exception as e:
             self.logger.warning(f"编码检测失败，使用默认UTF-8: {e}")
             return 'utf-8'
     
-    def load_text_file(self, file_path: str) -> str:
-        """加载文本文件，支持大文件分块读取"""
+    def load_text_file(self, file_path: str) -> Union[str, bytes, mmap.mmap]:
+        """加载文本文件，UTF-8文件直接内存映射，其他编码解码为字符串
+        
+        返回 mmap 时由调用方负责调用 close() 释放映射（analyze 会自动关闭）；
+        空的UTF-8文件无法映射，返回 b''。
+        """
         file_path = Path(file_path)
         
         if not file_path.exists():
@@ -85,15 +234,21 @@ class CharFrequencyAnalyzer:
         
         encoding = self.detect_encoding(file_path)
         
+        # UTF-8文件交给扫描器直接处理原始字节，由操作系统按需分页
+        if encoding in ('utf-8', 'utf-8-sig'):
+            if file_size == 0:
+                return b''
+            with open(file_path, 'rb') as f:
+                content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.logger.info(f"成功映射文件，字节数: {len(content)}")
+            return content
+        
         try:
-            # 对于大文件使用分块读取
-            if file_size > 50 * 1024 * 1024:  # 50MB以上
-                return self._load_large_file(file_path, encoding)
-            else:
-                with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
-                    content = f.read()
-                    self.logger.info(f"成功加载文件，字符数: {len(content)}")
-                    return content
+            # 一次性读取由C层I/O完成，分块读取再拼接只会多一次完整拷贝
+            with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
+                content = f.read()
+                self.logger.info(f"成功加载文件，字符数: {len(content)}")
+                return content
         except UnicodeDecodeError as e:
             self.logger.error(f"文件编码错误: {e}")
             # 尝试其他常见编码
@@ -107,73 +262,138 @@ class CharFrequencyAnalyzer:
                     continue
             raise Exception("无法使用任何编码读取文件")
     
-    def _load_large_file(self, file_path: Path, encoding: str) -> str:
-        """分块加载大文件"""
-        self.logger.info("检测到大文件，使用分块加载...")
-        content_parts = []
-        
-        with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
-            while True:
-                chunk = f.read(self.config.chunk_size)
-                if not chunk:
-                    break
-                content_parts.append(chunk)
-        
-        content = ''.join(content_parts)
-        self.logger.info(f"分块加载完成，总字符数: {len(content)}")
-        return content
-    
     def extract_chinese_chars(self, text: str) -> List[str]:
-        """提取汉字字符"""
+        """提取汉字字符
+        
+        已弃用：analyze 改用 _count_chinese_chars 一次完成提取与计数。
+        """
+        warnings.warn(
+            "extract_chinese_chars 已弃用，请使用 analyze 完成统计",
+            DeprecationWarning, stacklevel=2
+        )
+        # 按连续汉字串匹配后拼接，汉字范围本身已排除中文标点
+        return list(''.join(_CJK_RE.findall(text)))
+    
+    def _count_chinese_chars(self, text: Union[str, bytes, mmap.mmap],
+                             file_path: Optional[str] = None) -> Tuple[Counter, int]:
+        """提取并统计汉字，返回(频次计数器, 汉字总数)，不生成中间字符列表
+        
+        text 可以是字符串，也可以是UTF-8字节缓冲区(bytes/memoryview/mmap)。
+        只有来自 file_path 的大型内存映射文件才走多进程统计，内存数据始终串行处理。
+        """
         start_time = time.time()
         
-        # 汉字Unicode范围
-        chinese_pattern = r'[\u4e00-\u9fff]'
-        chinese_chars = re.findall(chinese_pattern, text)
+        # 直接在UTF-8字节上按块筛选汉字，避免展开为UTF-32
+        # 中文标点(\u3000-\u303f, \uff00-\uffef)不在汉字范围内，无需再次过滤
+        data = text.encode('utf-8') if isinstance(text, str) else text
         
-        # 过滤标点符号（如果配置要求）
-        if self.config.exclude_punctuation:
-            # 中文标点符号范围
-            punctuation_pattern = r'[\u3000-\u303f\uff00-\uffef]'
-            chinese_chars = [char for char in chinese_chars 
-                           if not re.match(punctuation_pattern, char)]
+        workers = self.config.max_workers or os.cpu_count() or 1
+        if (file_path is not None and isinstance(data, mmap.mmap)
+                and len(data) > self.config.parallel_threshold and workers > 1):
+            counter, total_chars = self._count_parallel(data, file_path, workers)
+        else:
+            counter, total_chars = _count_utf8_cjk(data)
         
-        extract_time = time.time() - start_time
-        self.logger.info(f"汉字提取完成，耗时: {extract_time:.2f}秒，提取字符数: {len(chinese_chars)}")
+        if self.logger.isEnabledFor(logging.INFO):
+            count_time = time.time() - start_time
+            self.logger.info(f"汉字统计完成，耗时: {count_time:.2f}秒，汉字总数: {total_chars}，唯一字符数: {len(counter)}")
         
-        return chinese_chars
+        return counter, total_chars
+    
+    def _count_parallel(self, data: mmap.mmap, file_path: str, workers: int) -> Tuple[Counter, int]:
+        """将映射文件按字符边界切分，多进程并行统计后合并
+        
+        只向子进程传递(路径, 起止偏移)，由子进程自行映射文件，避免复制数据。
+        """
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"数据量较大，使用 {workers} 个进程并行统计...")
+        
+        with memoryview(data) as view:
+            ranges = _split_utf8(view, workers)
+        
+        # 按码点槽位合并各区间结果，首次出现位置取最小值，保证并列字符的顺序与串行一致
+        size = 0x9FFF - 0x4E00 + 1
+        counts = np.zeros(size, dtype=np.int64)
+        first = np.full(size, np.iinfo(np.int64).max, dtype=np.int64)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            paths = [str(file_path)] * len(ranges)
+            starts = [start for start, _ in ranges]
+            ends = [end for _, end in ranges]
+            for values, chunk_counts, chunk_first in executor.map(_count_file_range, paths, starts, ends):
+                slots = values.astype(np.int64) - 0x4E00
+                counts[slots] += chunk_counts
+                first[slots] = np.minimum(first[slots], chunk_first)
+        
+        slots = np.flatnonzero(counts)
+        slots = slots[np.argsort(first[slots], kind='stable')]
+        return _tally_to_counter(slots + 0x4E00, counts[slots]), int(counts.sum())
+    
+    def _filter_low_frequency(self):
+        """过滤低于最小频次的字符"""
+        # 原地删除，避免再构造一个新的Counter
+        min_frequency = self.config.min_frequency
+        if min_frequency > 1:
+            for char, count in list(self.char_counter.items()):
+                if count < min_frequency:
+                    del self.char_counter[char]
     
-    def calculate_frequency(self, chars: List[str]) -> Dict[str, int]:
-        """计算字符频率"""
+    def calculate_frequency(self, chars) -> Dict[str, int]:
+        """计算字符频率，支持码点数组或字符的任意可迭代对象
+        
+        Counter(iterable) 由C实现的 _count_elements 计数，传入生成器即可，
+        调用方无需先构造完整的字符列表。
+        """
         start_time = time.time()
         
-        self.char_counter = Counter(chars)
+        if isinstance(chars, np.ndarray):
+            values, counts, _ = _tally_codepoints(chars)
+            self.char_counter = _tally_to_counter(values, counts)
+        else:
+            self.char_counter = Counter(chars)
         
         # 过滤低频词
-        if self.config.min_frequency > 1:
-            self.char_counter = Counter({
-                char: count for char, count in self.char_counter.items()
-                if count >= self.config.min_frequency
-            })
+        self._filter_low_frequency()
         
-        calc_time = time.time() - start_time
-        self.logger.info(f"频率计算完成，耗时: {calc_time:.2f}秒，唯一字符数: {len(self.char_counter)}")
+        if self.logger.isEnabledFor(logging.INFO):
+            calc_time = time.time() - start_time
+            self.logger.info(f"频率计算完成，耗时: {calc_time:.2f}秒，唯一字符数: {len(self.char_counter)}")
         
         return dict(self.char_counter)
     
     def get_top_characters(self, n: int = None) -> List[Tuple[str, int]]:
         """获取频次最高的前N个字符"""
         n = n or self.config.top_n
+        # 只取第一名时单次遍历求最大值，省去堆的构建
+        if n == 1 and self.char_counter:
+            return [max(self.char_counter.items(), key=operator.itemgetter(1))]
+        # 需要全部字符时直接整体排序，heapq.nlargest 反而更慢
+        if n >= len(self.char_counter):
+            return sorted(self.char_counter.items(), key=operator.itemgetter(1), reverse=True)
         return self.char_counter.most_common(n)
     
-    def generate_analysis_report(self, chars: List[str]) -> Dict:
-        """生成详细分析报告"""
-        total_chars = len(chars)
+    def generate_analysis_report(self, total_chars: Optional[int] = None) -> Dict:
+        """生成详细分析报告
+        
+        total_chars 为低频过滤前的汉字总数；省略时按当前计数器求和
+        （Python 3.10+ 提供 Counter.total）。
+        """
+        if total_chars is None:
+            if hasattr(self.char_counter, 'total'):
+                total_chars = self.char_counter.total()
+            else:
+                total_chars = sum(self.char_counter.values())
         unique_chars = len(self.char_counter)
         top_chars = self.get_top_characters()
         
-        # 统计分析
-        frequencies = list(self.char_counter.values())
+        # 统计分析：一次转为数组，由NumPy在C层计算最值与均值
+        frequencies = np.fromiter(self.char_counter.values(), dtype=np.int64,
+                                  count=len(self.char_counter))
+        if frequencies.size == 0:
+            max_freq, min_freq, avg_freq = 0, 0, 0
+        else:
+            max_freq = int(frequencies.max())
+            min_freq = int(frequencies.min())
+            avg_freq = float(frequencies.mean())
         
         report = {
             'basic_stats': {
@@ -182,9 +402,9 @@ class CharFrequencyAnalyzer:
                 'coverage_ratio': unique_chars / total_chars if total_chars > 0 else 0
             },
             'frequency_stats': {
-                'max_frequency': max(frequencies) if frequencies else 0,
-                'min_frequency': min(frequencies) if frequencies else 0,
-                'avg_frequency': sum(frequencies) / len(frequencies) if frequencies else 0
+                'max_frequency': max_freq,
+                'min_frequency': min_freq,
+                'avg_frequency': avg_freq
             },
             'top_characters': top_chars,
             'analysis_time': time.strftime('%Y-%m-%d %H:%M:%S')
@@ -208,8 +428,10 @@ class CharFrequencyAnalyzer:
         
         # 保存CSV格式结果
         csv_file = output_path / "top_characters.csv"
-        df = pd.DataFrame(report['top_characters'], columns=['字符', '频次'])
-        df.to_csv(csv_file, index=False, encoding='utf-8-sig')
+        with open(csv_file, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(['字符', '频次'])
+            writer.writerows(report['top_characters'])
         
         self.logger.info(f"结果已保存到: {output_path}")
     
@@ -226,6 +448,21 @@ class CharFrequencyAnalyzer:
             self.logger.warning("没有数据可供可视化")
             return
         
+        # 延迟导入绘图库，Web接口等不生成图表的路径无需承担导入开销
+        # 固定使用无界面的Agg后端，避免在服务进程中加载Tk/Qt
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        from matplotlib import rcParams
+        
+        # 配置中文字体
+        rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
+        rcParams['axes.unicode_minus'] = False
+        # 简化路径并分块光栅化，降低Agg后端的渲染开销
+        rcParams['path.simplify'] = True
+        rcParams['path.simplify_threshold'] = 0.1
+        rcParams['agg.path.chunksize'] = 10000
+        
         chars, frequencies = zip(*top_chars)
         
         # 柱状图
@@ -272,38 +509,73 @@ class CharFrequencyAnalyzer:
         try:
             # 1. 加载文本
             text = self.load_text_file(file_path)
-            if not text.strip():
-                raise ValueError("文件内容为空")
-            
-            # 2. 提取汉字
-            chinese_chars = self.extract_chinese_chars(text)
-            if not chinese_chars:
-                raise ValueError("未找到汉字内容")
-            
-            # 3. 计算频率
-            self.calculate_frequency(chinese_chars)
+            try:
+                return self._analyze_content(text, total_start_time, file_path)
+            finally:
+                if isinstance(text, mmap.mmap):
+                    text.close()
             
-            # 4. 生成报告
-            report = self.generate_analysis_report(chinese_chars)
-            
-            # 5. 保存结果
-            self.save_results(report)
+        except Exception as e:
+            self.logger.error(f"分析过程中出现错误: {e}")
+            raise
+    
+    def analyze_bytes(self, data: bytes) -> Dict:
+        """分析内存中的UTF-8文本，跳过文件读取与编码检测
+        
+        data 必须是合法的UTF-8，否则抛出 UnicodeDecodeError；
+        字节扫描器不做转码，GBK等编码的数据会被误判为汉字。
+        校验按块增量解码，不会为整个上传内容构造字符串。
+        """
+        self.logger.info("开始分析《三国演义》字频统计...")
+        total_start_time = time.time()
+        
+        try:
+            # 先校验编码，避免非UTF-8数据静默得到错误结果
+            _validate_utf8(data)
             
-            # 6. 生成可视化
-            self.generate_visualization()
+            return self._analyze_content(data, total_start_time)
             
+        except Exception as e:
+            self.logger.error(f"分析过程中出现错误: {e}")
+            raise
+    
+    def _analyze_content(self, text: Union[str, bytes, mmap.mmap], total_start_time: float,
+                         file_path: Optional[str] = None) -> Dict:
+        """对已加载的文本执行统计、报告、保存与可视化"""
+        # 清空上一次分析的状态，使同一个分析器实例可以重复使用
+        self.char_counter = Counter()
+        self.analysis_stats = {}
+        
+        if not text or (isinstance(text, str) and not text.strip()):
+            raise ValueError("文件内容为空")
+        
+        # 2. 提取汉字并计算频率
+        self.char_counter, total_chars = self._count_chinese_chars(text, file_path)
+        if total_chars == 0:
+            raise ValueError("未找到汉字内容")
+        
+        # 3. 过滤低频字符
+        self._filter_low_frequency()
+        
+        # 4. 生成报告
+        report = self.generate_analysis_report(total_chars)
+        
+        # 5. 保存结果
+        self.save_results(report)
+        
+        # 6. 生成可视化
+        self.generate_visualization()
+        
+        # 日志级别高于INFO时（如Web服务）跳过耗时统计与结果摘要的格式化
+        if self.logger.isEnabledFor(logging.INFO):
             total_time = time.time() - total_start_time
             self.logger.info(f"分析完成！总耗时: {total_time:.2f}秒")
             
             # 输出关键结果
             top_char, top_freq = self.get_top_characters(1)[0]
             self.logger.info(f"出现频次最高的汉字是: '{top_char}' (出现 {top_freq} 次)")
-            
-            return report
-            
-        except Exception as e:
-            self.logger.error(f"分析过程中出现错误: {e}")
-            raise
+        
+        return report
 
 # 使用示例
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 from flask import Flask, render_template, request, jsonify
+import logging
 import os
-import tempfile
 import sys
+import threading
+import time
 import traceback
 
 # 确保可以导入分析器
@@ -15,6 +17,28 @@ template_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templat
 app = Flask(__name__, template_folder=template_dir)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
+# Web服务只记录警告及以上的分析日志；时间戳由服务器日志提供，格式中不再重复
+_analyzer_logger = logging.getLogger('CharFrequencyAnalyzer')
+_analyzer_logger.setLevel(logging.WARNING)
+if not _analyzer_logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(name)s - %(levelname)s - %(message)s'))
+    _analyzer_logger.addHandler(_handler)
+
+# 各接口的分析配置固定不变，每个工作进程只创建一次分析器
+# 分析器在分析期间持有状态，多线程部署时用锁串行化
+_ANALYZE_CFG = AnalysisConfig(top_n=50, save_results=False, generate_charts=False)
+_DEMO_CFG = AnalysisConfig(top_n=20, save_results=False, generate_charts=False)
+_analyze_analyzer = CharFrequencyAnalyzer(_ANALYZE_CFG)
+_analyze_lock = threading.Lock()
+
+_DEMO_TEXT = """
+今今天是星期三
+"""* 50
+
+# 演示结果与请求无关，导入时计算一次
+_DEMO_RESULT = CharFrequencyAnalyzer(_DEMO_CFG).analyze_bytes(_DEMO_TEXT.encode('utf-8'))
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -29,19 +53,14 @@ def analyze_text():
         if file.filename == '':
             return jsonify({'error': '没有选择文件'}), 400
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
-            content = file.read().decode('utf-8')
-            f.write(content)
-            temp_path = f.name
-        
-        try:
-            config = AnalysisConfig(top_n=50, save_results=False, generate_charts=False)
-            analyzer = CharFrequencyAnalyzer(config)
-            results = analyzer.analyze(temp_path)
-            return jsonify({'success': True, 'results': results})
-        finally:
-            os.unlink(temp_path)
+        # 上传内容已在内存中，直接按UTF-8字节分析，无需落盘再读取
+        data = file.read()
+        with _analyze_lock:
+            results = _analyze_analyzer.analyze_bytes(data)
+        return jsonify({'success': True, 'results': results})
         
+    except UnicodeDecodeError:
+        return jsonify({'error': '文件不是UTF-8编码，请转换为UTF-8后重新上传'}), 400
     except Exception as e:
         print(f"分析错误: {str(e)}")
         print(traceback.format_exc())
@@ -49,40 +68,9 @@ def analyze_text():
 
 @app.route('/api/demo')
 def demo_analysis():
-    try:
-        # demo_text = """
-        # 话说天下大势，分久必合，合久必分。周末七国分争，并入于秦。
-        # 及秦灭后，楚、汉分争，又并入于汉。汉朝自高祖斩白蛇而起义，
-        # 一统天下，后来光武中兴，传至献帝，遂分为三国。推其致乱之由，
-        # 殆始于桓、灵二帝。桓帝禁锢善类，崇信阉宦。及桓帝崩，灵帝即位，
-        # 大将军窦武、太傅陈蕃共相辅佐。时有宦官曹节等弄权，窦武、陈蕃谋诛之，
-        # 机事不密，反为所害，中涓自此愈横。建宁二年四月望日，帝御温德殿。
-        # 方升座，殿角狂风骤起。只见一条大青蛇，从梁上飞将下来，蟠于椅上。
-        # 帝惊倒，左右急救入宫，百官俱奔避。须臾，蛇不见了。忽然大雷大雨，
-        # 加以冰雹，落到半夜方止，坏却宫殿门窗。中平元年，张角自称天公将军，
-        # 其弟张宝称地公将军，张梁称人公将军。角以太平道为名，私造谶书。
-        # """ * 50
-
-        demo_text = """
-        今今天是星期三
-        """* 50
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
-            f.write(demo_text)
-            temp_path = f.name
-        
-        try:
-            config = AnalysisConfig(top_n=20, save_results=False, generate_charts=False)
-            analyzer = CharFrequencyAnalyzer(config)
-            results = analyzer.analyze(temp_path)
-            return jsonify({'success': True, 'results': results})
-        finally:
-            os.unlink(temp_path)
-        
-    except Exception as e:
-        print(f"演示错误: {str(e)}")
-        print(traceback.format_exc())
-        return jsonify({'error': str(e)}), 500
+    # 演示文本固定不变，直接返回导入时预先计算好的结果，仅刷新分析时间
+    results = dict(_DEMO_RESULT, analysis_time=time.strftime('%Y-%m-%d %H:%M:%S'))
+    return jsonify({'success': True, 'results': results})
 
 if __name__ == "__main__":
     print(f"Template目录: {template_dir}")
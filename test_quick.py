@@ -29,5 +29,36 @@ def main():
     finally:
         os.unlink(temp_path)
 
+def check_parallel_consistency():
+    print("\n🎯 校验并行统计与串行结果一致...")
+    
+    # 频次并列的"乙"和"丁"分处文件首尾，会落在不同的并行区间
+    filler = "话说天下大势，分久必合，合久必分。\n" * 2000
+    demo_text = "乙乙乙" + filler + filler + "丁丁丁"
+    
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
+        f.write(demo_text)
+        temp_path = f.name
+    
+    try:
+        reports = []
+        for workers in (1, 2):
+            config = AnalysisConfig(top_n=50, save_results=False, generate_charts=False,
+                                    parallel_threshold=0, max_workers=workers)
+            reports.append(CharFrequencyAnalyzer(config).analyze(temp_path))
+        
+        serial, parallel = reports
+        if (serial['top_characters'] == parallel['top_characters']
+                and serial['basic_stats'] == parallel['basic_stats']):
+            print("✅ 并行与串行结果一致")
+        else:
+            print(f"❌ 并行与串行结果不一致: {serial['top_characters']} != {parallel['top_characters']}")
+        
+    except Exception as e:
+        print(f"❌ 测试失败: {e}")
+    finally:
+        os.unlink(temp_path)
+
 if __name__ == "__main__":
     main()
+    check_parallel_consistency()